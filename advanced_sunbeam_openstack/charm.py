@@ -30,8 +30,11 @@ configuration to the containers and managing the service running
 in the container.
 """
 
+import copy
+import hashlib
+import json
 import logging
-from typing import List
+from typing import Dict, List
 
 import ops.charm
 import ops.framework
@@ -56,9 +59,32 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         """Run constructor."""
         super().__init__(framework)
         self._state.set_default(bootstrapped=False)
+        self._state.set_default(config_hash=None)
+        self._bootstrapped_cache = bool(self._state.bootstrapped)
+        self._last_config_hash = self._state.config_hash
+        self._relation_names = frozenset(self.meta.relations.keys())
+        self._ready_cache: Dict[str, bool] = {}
+        self._relation_contexts = None
+        self._contexts_dirty = True
+        # Registered before the relation handlers so that stale readiness
+        # and contexts are dropped before any handler calls back into the
+        # charm.
+        for relation_name in self._relation_names:
+            relation_events = self.on[relation_name]
+            for relation_event in (
+                relation_events.relation_created,
+                relation_events.relation_joined,
+                relation_events.relation_changed,
+                relation_events.relation_departed,
+                relation_events.relation_broken,
+            ):
+                self.framework.observe(
+                    relation_event, self._on_relation_data_changed
+                )
         self.relation_handlers = self.get_relation_handlers()
         self.pebble_handlers = self.get_pebble_handlers()
         self.framework.observe(self.on.config_changed, self._on_config_changed)
+        self.framework.observe(self.on.upgrade_charm, self._reset_config_hash)
 
     def can_add_handler(
         self,
@@ -66,13 +92,13 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         handlers: List[sunbeam_rhandlers.RelationHandler],
     ) -> bool:
         """Whether a handler for the given relation can be added."""
-        if relation_name not in self.meta.relations.keys():
+        if relation_name not in self._relation_names:
             logging.debug(
                 f"Cannot add handler for relation {relation_name}, relation "
                 "not present in charm metadata"
             )
             return False
-        if relation_name in [h.relation_name for h in handlers]:
+        if relation_name in {h.relation_name for h in handlers}:
             logging.debug(
                 f"Cannot add handler for relation {relation_name}, handler "
                 "already present"
@@ -151,17 +177,21 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
                 return
 
         if not self.bootstrapped():
-            self._do_bootstrap()
+            # Overrides of _do_bootstrap returning None count as success.
+            if self._do_bootstrap() is False:
+                logging.debug("Aborting bootstrap failed")
+                return
             if self.unit.is_leader() and self.supports_peer_relation:
                 self.set_leader_ready()
+            self._bootstrapped_cache = True
+            self._state.bootstrapped = True
 
         self.unit.status = ops.model.ActiveStatus()
-        self._state.bootstrapped = True
 
     @property
     def supports_peer_relation(self) -> bool:
         """Whether the charm support the peers relation."""
-        return "peers" in self.meta.relations.keys()
+        return "peers" in self._relation_names
 
     @property
     def container_configs(self) -> List[sunbeam_core.ContainerConfigFile]:
@@ -198,8 +228,27 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         """
         return [self.service_name.replace("-", "_")]
 
+    def _config_hash(self) -> str:
+        """Digest of the current charm config."""
+        config = json.dumps(dict(self.config), sort_keys=True)
+        return hashlib.sha256(config.encode()).hexdigest()
+
     def _on_config_changed(self, event: ops.framework.EventBase) -> None:
+        config_hash = self._config_hash()
+        if config_hash == self._last_config_hash and self.bootstrapped():
+            logger.debug("Config unchanged, skipping configure_charm")
+            return
         self.configure_charm(None)
+        self._last_config_hash = config_hash
+        self._state.config_hash = config_hash
+
+    def _reset_config_hash(self, event: ops.framework.EventBase) -> None:
+        """Force the next config-changed to reconfigure the charm.
+
+        Templates may have changed in the new charm revision.
+        """
+        self._last_config_hash = None
+        self._state.config_hash = None
 
     def containers_ready(self) -> bool:
         """Determine whether all containers are ready for configuration."""
@@ -209,32 +258,62 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
                 return False
         return True
 
+    def _on_relation_data_changed(
+        self, event: ops.charm.RelationEvent
+    ) -> None:
+        """Drop cached state derived from the relation the event is for."""
+        self._ready_cache.pop(event.relation.name, None)
+        self.invalidate_contexts()
+
+    def invalidate_contexts(self) -> None:
+        """Force contexts to be rebuilt on next use."""
+        self._contexts_dirty = True
+
+    def handler_ready(
+        self, handler: sunbeam_rhandlers.RelationHandler
+    ) -> bool:
+        """Whether the handler is ready, cached until its relation changes."""
+        if handler.relation_name not in self._ready_cache:
+            self._ready_cache[handler.relation_name] = handler.ready
+        return self._ready_cache[handler.relation_name]
+
     def relation_handlers_ready(self) -> bool:
         """Determine whether all relations are ready for use."""
         for handler in self.relation_handlers:
-            if not handler.ready:
+            if not self.handler_ready(handler):
                 logger.info(f"Relation {handler.relation_name} incomplete")
                 return False
         return True
 
     def contexts(self) -> sunbeam_core.OPSCharmContexts:
-        """Construct context for rendering templates."""
-        ra = sunbeam_core.OPSCharmContexts(self)
-        for handler in self.relation_handlers:
-            if handler.relation_name not in self.meta.relations.keys():
-                logger.info(
-                    f"Dropping handler for relation {handler.relation_name}, "
-                    "relation not present in charm metadata"
-                )
-                continue
-            if handler.ready:
-                ra.add_relation_handler(handler)
+        """Construct context for rendering templates.
+
+        Relation handler contexts are rebuilt only when relation data has
+        changed since they were last constructed. Config contexts are
+        rebuilt on every call.
+        """
+        if self._contexts_dirty:
+            rel_ctxts = sunbeam_core.OPSCharmContexts(self)
+            for handler in self.relation_handlers:
+                if handler.relation_name not in self._relation_names:
+                    logger.info(
+                        f"Dropping handler for relation "
+                        f"{handler.relation_name}, relation not present in "
+                        "charm metadata"
+                    )
+                    continue
+                if self.handler_ready(handler):
+                    rel_ctxts.add_relation_handler(handler)
+            self._relation_contexts = rel_ctxts
+            self._contexts_dirty = False
+        ra = copy.copy(self._relation_contexts)
+        ra.namespaces = list(ra.namespaces)
         ra.add_config_contexts(self.config_contexts)
         return ra
 
     def bootstrapped(self) -> bool:
         """Determine whether the service has been boostrapped."""
-        return self._state.bootstrapped
+        return self._bootstrapped_cache
 
     def leader_set(self, settings: dict = None, **kwargs) -> None:
         """Juju set data in peer data bag."""
@@ -274,14 +353,17 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
             logger.warn(
                 "Not DB sync ran. Charm does not specify self.db_sync_cmds")
 
-    def _do_bootstrap(self) -> None:
-        """Perform bootstrap."""
+    def _do_bootstrap(self) -> bool:
+        """Perform bootstrap.
+
+        :returns: Whether bootstrap succeeded.
+        """
         try:
             self.run_db_sync()
         except sunbeam_cprocess.ContainerProcessError:
             logger.exception('Failed to bootstrap')
-            self._state.bootstrapped = False
-            return
+            return False
+        return True
 
 
 class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
@@ -326,21 +408,27 @@ class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
         )
         return self.service_url(svc_hostname)
 
+    @property
+    def _identity_service_address(self) -> str:
+        """Ingress address of the identity-service binding.
+
+        Looked up once per charm instance as each lookup is a network-get.
+        """
+        if "_identity_service_address_cache" not in self.__dict__:
+            self._identity_service_address_cache = self.model.get_binding(
+                "identity-service"
+            ).network.ingress_address
+        return self._identity_service_address_cache
+
     @property
     def admin_url(self) -> str:
         """Url for accessing the admin endpoint for this service."""
-        hostname = self.model.get_binding(
-            "identity-service"
-        ).network.ingress_address
-        return self.service_url(hostname)
+        return self.service_url(self._identity_service_address)
 
     @property
     def internal_url(self) -> str:
         """Url for accessing the internal endpoint for this service."""
-        hostname = self.model.get_binding(
-            "identity-service"
-        ).network.ingress_address
-        return self.service_url(hostname)
+        return self.service_url(self._identity_service_address)
 
     def get_pebble_handlers(self) -> List[sunbeam_chandlers.PebbleHandler]:
         """Pebble handlers for the service."""
@@ -89,9 +89,16 @@ class OperatorPeers(Object):
         self.on.peers_data_changed.emit()
 
     def set_app_data(self, settings: typing.Dict[str, str]) -> None:
-        """Publish settings on the peer app data bag."""
+        """Publish settings on the peer app data bag.
+
+        Keys which already hold the requested value are not rewritten. As
+        no write is attempted for them, setting an unchanged value does not
+        raise RelationDataError on a non-leader unit.
+        """
+        app_data_bag = self._app_data_bag
         for k, v in settings.items():
-            self._app_data_bag[k] = v
+            if app_data_bag.get(k) != v:
+                app_data_bag[k] = v
 
     def get_app_data(self, key: str) -> None:
         """Get the value corresponding to key from the app data bag."""
@@ -390,6 +390,10 @@ class BasePeerHandler(RelationHandler):
     def set_app_data(self, settings: dict) -> None:
         """Store data in peer app db."""
         self.interface.set_app_data(settings)
+        # Contexts built before this write hold the old peer data.
+        invalidate_contexts = getattr(self.charm, "invalidate_contexts", None)
+        if invalidate_contexts:
+            invalidate_contexts()
 
     def get_app_data(self, key: str) -> str:
         """Retrieve data from the peer relation."""
@@ -16,7 +16,7 @@
 
 import logging
 import os
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     import advanced_sunbeam_openstack.core as sunbeam_core
@@ -27,6 +27,40 @@ import jinja2
 
 log = logging.getLogger(__name__)
 
+# Jinja2 environments shared within this process, keyed on
+# (template_dir, openstack_release).
+_JINJA_ENVS: Dict[Tuple[str, str], jinja2.Environment] = {}
+
+
+def get_jinja_env(
+    template_dir: str, openstack_release: str
+) -> jinja2.Environment:
+    """Jinja2 environment for rendering templates in template_dir.
+
+    Environments are cached for the life of the process and compiled
+    templates are persisted in jinja2's per-user bytecode cache so that
+    subsequent hook executions do not need to recompile them. If the
+    bytecode cache directory cannot be used templates are compiled as
+    normal.
+    """
+    key = (template_dir, openstack_release)
+    if key not in _JINJA_ENVS:
+        try:
+            bytecode_cache = jinja2.FileSystemBytecodeCache()
+        except (OSError, RuntimeError):
+            log.warning(
+                "Jinja2 bytecode cache unavailable, templates will not be "
+                "cached between hooks.",
+                exc_info=True,
+            )
+            bytecode_cache = None
+        _JINJA_ENVS[key] = jinja2.Environment(
+            loader=get_loader(template_dir, openstack_release),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+        )
+    return _JINJA_ENVS[key]
+
 
 def get_container(
     containers: List['ops.model.Container'], name: str
@@ -47,16 +81,15 @@ def sidecar_config_render(
     context: 'sunbeam_core.OPSCharmContexts',
 ) -> None:
     """Render templates inside containers."""
-    loader = get_loader(template_dir, openstack_release)
-    _tmpl_env = jinja2.Environment(loader=loader)
+    jinja_env = get_jinja_env(template_dir, openstack_release)
     for config in container_configs:
         for container_name in config.container_names:
             try:
-                template = _tmpl_env.get_template(
+                template = jinja_env.get_template(
                     os.path.basename(config.path) + ".j2"
                 )
             except jinja2.exceptions.TemplateNotFound:
-                template = _tmpl_env.get_template(
+                template = jinja_env.get_template(
                     os.path.basename(config.path)
                 )
             container = get_container(containers, container_name)
@@ -15,12 +15,15 @@
 """Test aso."""
 
 import json
+import mock
 import sys
 
 sys.path.append('lib')  # noqa
 sys.path.append('src')  # noqa
 
 import advanced_sunbeam_openstack.charm as sunbeam_charm
+import advanced_sunbeam_openstack.cprocess as sunbeam_cprocess
+import advanced_sunbeam_openstack.templating as sunbeam_templating
 import advanced_sunbeam_openstack.test_utils as test_utils
 from . import test_charms
 
@@ -76,6 +79,75 @@ class TestOSBaseOperatorCharm(test_utils.CharmTestCase):
         self.assertTrue(
             self.harness.charm.relation_handlers_ready())
 
+    def test_bootstrapped(self) -> None:
+        """Test bootstrapped flag is only written when it changes."""
+        charm = self.harness.charm
+        self.assertFalse(charm.bootstrapped())
+        self.set_pebble_ready()
+        self.assertTrue(charm.bootstrapped())
+        self.assertTrue(charm._state.bootstrapped)
+        charm._state.bootstrapped = False
+        charm.configure_charm(None)
+        self.assertTrue(charm.bootstrapped())
+        self.assertFalse(charm._state.bootstrapped)
+
+    def test_bootstrapped_from_stored_state(self) -> None:
+        """Test bootstrapped flag is loaded from stored state."""
+        harness = test_utils.get_harness(
+            test_charms.MyCharm,
+            test_charms.CHARM_METADATA,
+            self.container_calls)
+        self.addCleanup(harness.cleanup)
+        harness.framework._storage.save_snapshot(
+            'MyCharm/StoredStateData[_state]',
+            {'bootstrapped': True})
+        harness.begin()
+        self.assertTrue(harness.charm.bootstrapped())
+
+    def test_bootstrap_failed(self) -> None:
+        """Test a failed bootstrap is not recorded."""
+        charm = self.harness.charm
+        with mock.patch.object(
+                charm, 'run_db_sync',
+                side_effect=sunbeam_cprocess.ContainerProcessError('fail')):
+            self.set_pebble_ready()
+        self.assertFalse(charm.bootstrapped())
+        self.assertFalse(charm._state.bootstrapped)
+
+    def test_config_changed_unchanged(self) -> None:
+        """Test charm is not reconfigured when config is unchanged."""
+        self.set_pebble_ready()
+        self.harness.update_config(test_charms.CHARM_CONFIG)
+        self.harness.update_config(test_charms.CHARM_CONFIG)
+        self.assertEqual(
+            self.harness.charm.seen_events,
+            ['PebbleReadyEvent', 'ConfigChangedEvent', 'NoneType',
+             'ConfigChangedEvent'])
+        self.harness.update_config({'debug': 'false'})
+        self.assertEqual(
+            self.harness.charm.seen_events[-2:],
+            ['ConfigChangedEvent', 'NoneType'])
+
+    def test_config_changed_after_upgrade(self) -> None:
+        """Test charm is reconfigured after upgrade with unchanged config."""
+        self.set_pebble_ready()
+        self.harness.update_config(test_charms.CHARM_CONFIG)
+        self.harness.charm.on.upgrade_charm.emit()
+        self.harness.update_config(test_charms.CHARM_CONFIG)
+        self.assertEqual(
+            self.harness.charm.seen_events,
+            ['PebbleReadyEvent', 'ConfigChangedEvent', 'NoneType',
+             'ConfigChangedEvent', 'NoneType'])
+
+    def test_get_jinja_env(self) -> None:
+        """Test jinja environment is reused for a template dir."""
+        charm = self.harness.charm
+        self.assertIs(
+            sunbeam_templating.get_jinja_env(
+                charm.template_dir, charm.openstack_release),
+            sunbeam_templating.get_jinja_env(
+                charm.template_dir, charm.openstack_release))
+
 
 class TestOSBaseOperatorAPICharm(test_utils.CharmTestCase):
     """Test for the OSBaseOperatorAPICharm class."""
@@ -210,3 +282,104 @@ class TestOSBaseOperatorAPICharm(test_utils.CharmTestCase):
         self.assertFalse(self.harness.charm.is_leader_ready())
         self.harness.charm.set_leader_ready()
         self.assertTrue(self.harness.charm.is_leader_ready())
+
+    def test_can_add_handler(self) -> None:
+        """Test handlers are only added for new, known relations."""
+        charm = self.harness.charm
+        handlers = charm.relation_handlers
+        self.assertEqual(
+            sorted(h.relation_name for h in handlers),
+            ['amqp', 'identity-service', 'ingress', 'peers', 'shared-db'])
+        self.assertFalse(charm.can_add_handler('amqp', handlers))
+        self.assertFalse(charm.can_add_handler('ceph', handlers))
+        self.assertTrue(charm.can_add_handler('amqp', []))
+        self.assertTrue(
+            charm.can_add_handler('amqp', [charm.id_svc, charm.db]))
+
+    def test_handler_ready_cache(self) -> None:
+        """Test handler readiness is refreshed when relation changes."""
+        charm = self.harness.charm
+        self.assertFalse(charm.handler_ready(charm.amqp))
+        rel_id = self.harness.add_relation('amqp', 'rabbitmq')
+        self.assertNotIn('amqp', charm._ready_cache)
+        self.assertFalse(charm.handler_ready(charm.amqp))
+        self.harness.add_relation_unit(rel_id, 'rabbitmq/0')
+        self.assertNotIn('amqp', charm._ready_cache)
+        self.harness.update_relation_data(
+            rel_id, 'rabbitmq/0', {'ingress-address': '10.0.0.13'})
+        self.assertFalse(
+            self.harness.charm.handler_ready(self.harness.charm.amqp))
+        test_utils.add_amqp_relation_credentials(self.harness, rel_id)
+        self.assertTrue(
+            self.harness.charm.handler_ready(self.harness.charm.amqp))
+
+    def test_contexts_cache(self) -> None:
+        """Test relation contexts are rebuilt only when relation changes."""
+        charm = self.harness.charm
+        db_rel_id = test_utils.add_base_db_relation(self.harness)
+        with mock.patch.object(
+                charm.db, 'context', wraps=charm.db.context) as db_context:
+            charm.contexts()
+            charm.contexts()
+            db_context.assert_not_called()
+            test_utils.add_db_relation_credentials(self.harness, db_rel_id)
+            charm.contexts()
+            charm.contexts()
+            db_context.assert_called_once_with()
+        contexts = self.harness.charm.contexts()
+        self.assertEqual(
+            contexts.shared_db.database_password,
+            'hardpassword')
+        self.harness.update_config({'debug': 'false'})
+        self.assertEqual(
+            self.harness.charm.contexts().options.debug,
+            'false')
+        self.assertEqual(
+            self.harness.charm.contexts().namespaces.count('options'),
+            1)
+
+    def test_peer_leader_set_multiple(self) -> None:
+        """Test setting multiple keys in the peer app db."""
+        rel_id = self.harness.add_relation('peers', 'my-service')
+        self.harness.add_relation_unit(
+            rel_id,
+            'my-service/1')
+        self.harness.set_leader()
+        self.harness.charm.leader_set({'foo': 'bar', 'ready': 'true'})
+        backend = self.harness._backend
+        with mock.patch.object(
+                backend, 'relation_set',
+                wraps=backend.relation_set) as relation_set:
+            self.harness.charm.leader_set({'foo': 'bar', 'ready': 'false'})
+        relation_set.assert_called_once_with(
+            rel_id, 'ready', 'false', True)
+        rel_data = self.harness.get_relation_data(rel_id, 'my-service')
+        self.assertEqual(
+            rel_data,
+            {'foo': 'bar', 'ready': 'false'})
+
+    def test_contexts_peer_data_set(self) -> None:
+        """Test contexts see peer data written through the handler."""
+        rel_id = self.harness.add_relation('peers', 'my-service')
+        self.harness.add_relation_unit(
+            rel_id,
+            'my-service/1')
+        self.harness.set_leader()
+        self.harness.charm.peers.set_app_data({'foo': 'bar'})
+        self.assertEqual(self.harness.charm.contexts().peers.foo, 'bar')
+        self.harness.charm.peers.set_app_data({'foo': 'baz'})
+        self.assertEqual(self.harness.charm.contexts().peers.foo, 'baz')
+
+    def test_endpoint_urls(self) -> None:
+        """Test admin and internal urls share one binding lookup."""
+        model = self.harness.charm.model
+        with mock.patch.object(
+                model, 'get_binding',
+                wraps=model.get_binding) as get_binding:
+            self.assertEqual(
+                self.harness.charm.admin_url,
+                'http://10.0.0.10:789')
+            self.assertEqual(
+                self.harness.charm.internal_url,
+                'http://10.0.0.10:789')
+        get_binding.assert_called_once_with('identity-service')